@@ -3,18 +3,19 @@
 import argparse
 import sys
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, Iterator, Callable
 import logging
 from datetime import datetime
+from functools import cached_property
+from contextlib import contextmanager
 
-from src.processor.image_processor import ImageProcessor
-from src.processor.char_processor import CharacterProcessor
-from src.utils.file_handlers import FileHandler
 from src.config.settings import SettingsManager
 from src.utils.validators import ValidationError
 
 import time
 import os
+import queue
+import threading
 
 # Set up logging
 logging.basicConfig(
@@ -23,18 +24,53 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Marks the end of the frame stream in the GIF prefetch queue
+_END_OF_FRAMES = object()
+
+_GIF_EXT = '.gif'
+
+# ANSI cursor-home + clear-screen, used between GIF frames
+_CLEAR_SCREEN = '\x1b[H\x1b[2J'
+
+@contextmanager
+def _fine_sleep_resolution():
+    """Drop the Windows timer resolution from ~15.6 ms to 1 ms while active."""
+    if os.name != 'nt':
+        yield
+        return
+
+    import ctypes
+    winmm = ctypes.WinDLL('winmm')
+    winmm.timeBeginPeriod(1)
+    try:
+        yield
+    finally:
+        winmm.timeEndPeriod(1)
+
 class ASCIIArtGenerator:
     """Main class for the ASCII Art Generator application."""
 
     def __init__(self):
+        # Deferred so that `--help` and argument errors don't wait on
+        # Pillow/numpy/rembg being imported
+        from src.processor.image_processor import ImageProcessor
+        from src.processor.char_processor import CharacterProcessor
+
         self.settings_manager = SettingsManager()
-        self.file_handler = FileHandler(
-            output_dir=self.settings_manager.get_output_settings().output_dir,
-            temp_dir=self.settings_manager.get_output_settings().temp_dir
-        )
         self.image_processor = ImageProcessor()
         self.char_processor = CharacterProcessor()
 
+    @cached_property
+    def file_handler(self):
+        """File handler, created on first use since it creates the output/temp directories."""
+        from src.utils.file_handlers import FileHandler
+
+        output_settings = self.settings_manager.get_output_settings()
+        return FileHandler(
+            output_dir=output_settings.output_dir,
+            temp_dir=output_settings.temp_dir
+        )
+
     def process_image(
         self,
         image_path: str,
@@ -96,15 +132,25 @@ class ASCIIArtGenerator:
             logger.error(f"Error processing image: {e}")
             raise
 
-    def _create_metadata(self, image_path, ascii_settings, chars, extra_params):
+    def _create_metadata(
+        self,
+        image_path,
+        ascii_settings,
+        custom_chars=None,
+        color_mode='none',
+        pattern_mode=False,
+        extra_params=None
+    ):
         """Create metadata for ASCII art output."""
         return {
             'source_image': image_path,
             'timestamp': datetime.now().isoformat(),
             'settings': {
                 'width': ascii_settings.width,
-                'chars': chars,
-                **extra_params
+                'chars': custom_chars,
+                'color_mode': color_mode,
+                'pattern_mode': pattern_mode,
+                **(extra_params or {})
             },
             'version': self.settings_manager.settings.version
         }
@@ -123,17 +169,87 @@ class ASCIIArtGenerator:
                 **kwargs
             )
 
-            # Display animation
+            # Display animation while the next frames decode in the background
             frame_delay = 1 / fps
-            for frame in frames:
-                os.system('cls' if os.name == 'nt' else 'clear')
-                print(frame)
-                time.sleep(frame_delay)
+            frames = self._prefetch_frames(frames)
+
+            # Show the first frame as soon as it is ready and schedule the
+            # rest against a fixed deadline so sleep overshoot doesn't drift
+            first = next(frames, None)
+            if first is None:
+                return
+            display_frame = self._frame_writer()
+            display_frame(first)
+            next_deadline = time.perf_counter() + frame_delay
+
+            with _fine_sleep_resolution():
+                for frame in frames:
+                    time.sleep(max(0.0, next_deadline - time.perf_counter()))
+                    display_frame(frame)
+                    next_deadline += frame_delay
 
         except Exception as e:
             logger.error(f"Error processing GIF: {e}")
             raise
-        
+
+    def _frame_writer(self) -> Callable[[str], None]:
+        """
+        Build a function that replaces the terminal contents with a frame.
+
+        The cursor-home/clear escape goes out in the same write as the frame.
+        When stdout is the real console the encoded frame is written straight
+        to the binary buffer, skipping the text layer. If colorama has wrapped
+        stdout (to translate escapes on Windows or strip them when piped),
+        frames go through the wrapper instead.
+        """
+        stdout = sys.stdout
+        if stdout is not sys.__stdout__ or not hasattr(stdout, 'buffer'):
+            def write_text(frame: str) -> None:
+                stdout.write(_CLEAR_SCREEN + frame + '\n')
+                stdout.flush()
+            return write_text
+
+        stdout.flush()
+        buffer = stdout.buffer
+        encoding = stdout.encoding or 'utf-8'
+        clear = _CLEAR_SCREEN.encode(encoding)
+
+        def write_bytes(frame: str) -> None:
+            buffer.write(clear + frame.encode(encoding) + b'\n')
+            buffer.flush()
+        return write_bytes
+
+    def _prefetch_frames(self, frames: Iterator[str], lookahead: int = 4) -> Iterator[str]:
+        """
+        Consume a frame generator on a producer thread.
+
+        Keeps up to `lookahead` converted frames queued so decoding overlaps
+        with the display delay instead of adding to it.
+
+        Args:
+            frames: Generator of ASCII frames
+            lookahead: Maximum number of frames decoded ahead of display
+        """
+        buffer: queue.Queue = queue.Queue(maxsize=lookahead)
+
+        def producer():
+            try:
+                for frame in frames:
+                    buffer.put(frame)
+                buffer.put(_END_OF_FRAMES)
+            except Exception as e:
+                # Re-raised on the consumer side
+                buffer.put(e)
+
+        threading.Thread(target=producer, daemon=True).start()
+
+        while True:
+            item = buffer.get()
+            if item is _END_OF_FRAMES:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
 
 
 def parse_arguments():
@@ -162,7 +278,13 @@ Examples:
     parser.add_argument('--format', choices=['txt', 'html', 'md'], 
                        default='txt', help='Output format')
 
-    return parser.parse_args()
+    args = parser.parse_args()
+
+    # Resolve the input type once so callers don't re-parse the path
+    args.ext = Path(args.input).suffix.lower()
+    args.is_gif = args.ext == _GIF_EXT
+
+    return args
 
 def main():
     """Main entry point for the ASCII Art Generator."""
@@ -170,8 +292,7 @@ def main():
         args = parse_arguments()
         generator = ASCIIArtGenerator()
 
-        is_gif = args.input.lower().endswith('.gif')
-        if is_gif:
+        if args.is_gif:
                 generator.process_gif(
                 image_path=args.input,
                 width=args.width,
@@ -4,11 +4,15 @@ setup(
     name="ascii-art-generator",
     version="0.1.0",
     packages=find_packages(),
+    python_requires='>=3.10',
     install_requires=[
         'Pillow>=9.5.0',
         'rembg>=2.0.50',
         'numpy>=1.24.3',
         'colorama>=0.4.6',
+        'orjson>=3.8.0',
+        'msgpack>=1.0.0',
+        'zstandard>=0.21.0',
     ],
     entry_points={
         'console_scripts': [
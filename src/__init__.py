@@ -9,8 +9,26 @@ __version__ = "1.0.0"
 __author__ = "Marxel Abogado"
 __email__ = "xyldxal@gmail.com"
 
-from .processor.image_processor import ImageProcessor
-from .processor.char_processor import CharacterProcessor
-from .config.settings import SettingsManager
+import importlib
+from typing import TYPE_CHECKING
 
-__all__ = ['ImageProcessor', 'CharacterProcessor', 'SettingsManager']
\ No newline at end of file
+if TYPE_CHECKING:
+    from .processor.image_processor import ImageProcessor
+    from .processor.char_processor import CharacterProcessor
+    from .config.settings import SettingsManager
+
+__all__ = ['ImageProcessor', 'CharacterProcessor', 'SettingsManager']
+
+# Exports are resolved on first access (PEP 562) so that importing the
+# package does not pull in Pillow, numpy and rembg up front
+_LAZY_EXPORTS = {
+    'ImageProcessor': '.processor.image_processor',
+    'CharacterProcessor': '.processor.char_processor',
+    'SettingsManager': '.config.settings',
+}
+
+def __getattr__(name: str):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,15 +2,62 @@ from typing import Dict, Any, Optional, Union
 from pathlib import Path
 import json
 import os
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field, fields
 import logging
-from datetime import datetime
+from datetime import date, datetime
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+def json_default(obj: Any) -> Any:
+    """
+    Convert values JSON can't represent directly, the same way orjson does.
+
+    orjson handles datetimes and (with OPT_SERIALIZE_NUMPY) numpy values
+    natively; this keeps the stdlib fallback in step and covers Paths.
+    """
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Path):
+        return str(obj)
+    if hasattr(obj, 'tolist'):
+        # numpy arrays and scalars
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dumps_json(data: Dict[str, Any]) -> bytes:
+    """
+    Serialize settings to indented JSON, using orjson when available.
+
+    The stdlib fallback is configured to write the same bytes as orjson:
+    2-space indent (orjson's only option) and UTF-8 rather than escapes.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=json_default, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False, default=json_default).encode('utf-8')
+
+def _loads_json(raw: bytes) -> Dict[str, Any]:
+    """Parse settings JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _fields_to_dict(obj: Any) -> Dict[str, Any]:
+    """Convert a flat settings dataclass to a dict, storing Paths as strings."""
+    result = {}
+    for f in fields(obj):
+        value = getattr(obj, f.name)
+        result[f.name] = str(value) if isinstance(value, Path) else value
+    return result
+
+# Immutable, so a single instance is shared as the dataclass default
+_SUPPORTED_FORMATS = frozenset({'.jpg', '.jpeg', '.png', '.bmp', '.gif'})
+
+@dataclass(slots=True)
 class ASCIIArtSettings:
     """
     Data class for ASCII art conversion settings.
@@ -23,7 +70,7 @@ class ASCIIArtSettings:
     brightness: float = 1.0
     contrast: float = 1.0
 
-@dataclass
+@dataclass(slots=True)
 class CharacterSettings:
     """
     Data class for character set settings.
@@ -36,7 +83,7 @@ class CharacterSettings:
     allow_special: bool = True
     use_color: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class OutputSettings:
     """
     Data class for output settings.
@@ -49,7 +96,7 @@ class OutputSettings:
     include_metadata: bool = True
     save_original: bool = True
 
-@dataclass
+@dataclass(slots=True)
 class ApplicationSettings:
     """
     Main settings class that contains all configuration options.
@@ -59,7 +106,7 @@ class ApplicationSettings:
     output: OutputSettings = field(default_factory=OutputSettings)
     
     # Additional settings
-    supported_image_formats: set = field(default_factory=lambda: {'.jpg', '.jpeg', '.png', '.bmp', '.gif'})
+    supported_image_formats: frozenset = _SUPPORTED_FORMATS
     max_image_size: tuple = (5000, 5000)
     min_image_size: tuple = (10, 10)
     debug_mode: bool = False
@@ -85,8 +132,8 @@ class SettingsManager:
         """Load settings from configuration file."""
         try:
             if self.config_path.exists():
-                with open(self.config_path, 'r') as f:
-                    data = json.load(f)
+                with open(self.config_path, 'rb') as f:
+                    data = _loads_json(f.read())
                 self._update_settings(data)
                 logger.info("Settings loaded successfully")
             else:
@@ -106,8 +153,8 @@ class SettingsManager:
             self.config_path.parent.mkdir(parents=True, exist_ok=True)
             
             # Save settings
-            with open(self.config_path, 'w') as f:
-                json.dump(settings_dict, f, indent=4, default=str)
+            with open(self.config_path, 'wb') as f:
+                f.write(_dumps_json(settings_dict))
             
             logger.info("Settings saved successfully")
         except Exception as e:
@@ -116,14 +163,9 @@ class SettingsManager:
     def _settings_to_dict(self) -> dict:
         """Convert settings to dictionary format."""
         return {
-            'ascii_art': asdict(self.settings.ascii_art),
-            'character': asdict(self.settings.character),
-            'output': {
-                **asdict(self.settings.output),
-                'output_dir': str(self.settings.output.output_dir),
-                'temp_dir': str(self.settings.output.temp_dir),
-                'backup_dir': str(self.settings.output.backup_dir)
-            },
+            'ascii_art': _fields_to_dict(self.settings.ascii_art),
+            'character': _fields_to_dict(self.settings.character),
+            'output': _fields_to_dict(self.settings.output),
             'supported_image_formats': list(self.settings.supported_image_formats),
             'max_image_size': self.settings.max_image_size,
             'min_image_size': self.settings.min_image_size,
@@ -158,7 +200,7 @@ class SettingsManager:
 
             # Update other settings
             if 'supported_image_formats' in data:
-                self.settings.supported_image_formats = set(data['supported_image_formats'])
+                self.settings.supported_image_formats = frozenset(data['supported_image_formats'])
             if 'max_image_size' in data:
                 self.settings.max_image_size = tuple(data['max_image_size'])
             if 'min_image_size' in data:
@@ -221,8 +263,8 @@ class SettingsManager:
         backup_path = self.config_path.with_name(f"config_backup_{timestamp}.json")
         
         try:
-            with open(backup_path, 'w') as f:
-                json.dump(self._settings_to_dict(), f, indent=4, default=str)
+            with open(backup_path, 'wb') as f:
+                f.write(_dumps_json(self._settings_to_dict()))
             logger.info(f"Settings backup created at {backup_path}")
             return backup_path
         except Exception as e:
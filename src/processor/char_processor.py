@@ -1,7 +1,42 @@
-from typing import List, Optional, Set
+from typing import Dict, List, Optional, Set
 import string
+from functools import lru_cache
+from types import MappingProxyType
+import numpy as np
 from ..utils.validators import validate_chars
 
+# Built-in character styles, built once at import
+_PRESET_STYLES = MappingProxyType({
+    'BINARY': ('1', '0'),
+    'MATRIX': ('M', 'A', 'T', 'R', 'I', 'X'),
+    'BLOCKS': ('█', '▓', '▒', '░', ' '),
+    'SIMPLE': ('#', ' '),
+    'DETAILED': tuple("$@B%8&WM#*oahkbdpqwmZO0QLCJUYXzcvunxrjft/\\|()1{}[]?-_+~<>i!lI;:,\"^`'. "),
+    'DOTS': ('●', '•', '°', '·', ' '),
+    'CARDS': ('♠', '♣', '♥', '♦'),
+    'WEATHER': ('☀', '⛅', '☁', '🌧', '⛈'),
+})
+
+@lru_cache(maxsize=None)
+def gradient_indices(n: int) -> np.ndarray:
+    """
+    Map every 8-bit luminance to an index into a gradient of `n` characters.
+
+    Shared by CharacterProcessor.build_lut and ImageProcessor so there is a
+    single definition of how brightness spreads over a character set.
+
+    Returns:
+        np.ndarray: Read-only integer array of shape (256,)
+    """
+    # Same float step and truncation as the original per-pixel loop,
+    # int(p / (255 / (n - 1))), so every pixel keeps its character
+    step = 255 / (n - 1) if n > 1 else np.inf
+    # intp, not uint8: CLI custom sets aren't capped at MAX_CHARS and an
+    # index above 255 would otherwise wrap around
+    indices = (np.arange(256) / step).astype(np.intp)
+    indices.setflags(write=False)
+    return indices
+
 class CharacterProcessor:
     """
     Class for handling ASCII character sets.
@@ -18,10 +53,10 @@ class CharacterProcessor:
     MAX_CHARS = 50
 
     def __init__(self, custom_chars: Optional[str] = None):
-        self.DEFAULT_CHARS = ["@", "#", "S", "%", "?", "*", "+", ";", ":", ",", "."]
-        self.MIN_CHARS = 2
-        self.MAX_CHARS = 50
         self._chars: List[str] = []
+        self._original_input: Optional[str] = None
+        self._custom_presets: Dict[str, List[str]] = {}
+        self._lut: Optional[np.ndarray] = None
         self.set_chars(custom_chars)
 
     def set_chars(self, chars: Optional[str]) -> None:
@@ -31,8 +66,10 @@ class CharacterProcessor:
         Args:
             chars: String of characters to use (will be used in sequence)
         """
+        self._original_input = chars
         if chars is None:
-            self._chars = self.DEFAULT_CHARS
+            self._chars = self.DEFAULT_CHARS.copy()
+            self._invalidate_lut()
             return
 
         # Convert string to list of characters, preserving order
@@ -43,11 +80,32 @@ class CharacterProcessor:
         
         # Set the characters
         self._chars = char_list
+        self._invalidate_lut()
 
     def get_chars(self) -> List[str]:
         """Get current character set."""
         return self._chars.copy()
 
+    def build_lut(self) -> np.ndarray:
+        """
+        Build a lookup table mapping every 8-bit luminance to a character.
+
+        The table is cached until the character set changes. Index it with a
+        uint8 grayscale array and decode the result in one go, e.g.
+        ``lut[pixels].tobytes().decode('utf-32-le')``.
+
+        Returns:
+            np.ndarray: uint32 array of shape (256,) holding code points
+        """
+        if self._lut is None:
+            codes = np.frombuffer(''.join(self._chars).encode('utf-32-le'), dtype=np.uint32)
+            self._lut = codes[gradient_indices(len(self._chars))]
+        return self._lut
+
+    def _invalidate_lut(self) -> None:
+        """Drop the cached lookup table after the character set changes."""
+        self._lut = None
+
     def _process_custom_chars(self, input_string: str) -> List[str]:
         """
         Process input string into a list of unique characters.
@@ -59,8 +117,9 @@ class CharacterProcessor:
             List of unique characters maintaining original order
         """
         # Check if it's a preset style name
-        if input_string.upper() in self._preset_styles:
-            return self._preset_styles[input_string.upper()]
+        preset = self._get_preset(input_string.upper())
+        if preset is not None:
+            return preset
 
         # Process as regular string
         seen: Set[str] = set()
@@ -73,23 +132,17 @@ class CharacterProcessor:
                 
         return chars
 
-    def _initialize_presets(self) -> dict:
-        """Initialize preset character styles."""
-        return {
-            'BINARY': ['1', '0'],
-            'MATRIX': ['M', 'A', 'T', 'R', 'I', 'X'],
-            'BLOCKS': ['█', '▓', '▒', '░', ' '],
-            'SIMPLE': ['#', ' '],
-            # Fixed the escape sequence
-            'DETAILED': list("$@B%8&WM#*oahkbdpqwmZO0QLCJUYXzcvunxrjft/\\|()1{}[]?-_+~<>i!lI;:,\"^`'. "),
-            'DOTS': ['●', '•', '°', '·', ' '],
-            'CARDS': ['♠', '♣', '♥', '♦'],
-            'WEATHER': ['☀', '⛅', '☁', '🌧', '⛈'],
-        }
+    def _get_preset(self, name: str) -> Optional[List[str]]:
+        """Look up a built-in or custom preset by its upper-case name."""
+        if name in _PRESET_STYLES:
+            return list(_PRESET_STYLES[name])
+        if name in self._custom_presets:
+            return self._custom_presets[name].copy()
+        return None
 
     def get_preset_names(self) -> List[str]:
         """Get list of available preset style names."""
-        return list(self._preset_styles.keys())
+        return list(_PRESET_STYLES) + list(self._custom_presets)
 
     def apply_preset(self, preset_name: str) -> None:
         """
@@ -102,12 +155,14 @@ class CharacterProcessor:
             ValueError: If preset name doesn't exist
         """
         preset_name = preset_name.upper()
-        if preset_name not in self._preset_styles:
+        preset = self._get_preset(preset_name)
+        if preset is None:
             raise ValueError(f"Unknown preset style: {preset_name}. "
                            f"Available presets: {', '.join(self.get_preset_names())}")
         
-        self._chars = self._preset_styles[preset_name].copy()
+        self._chars = preset
         self._original_input = preset_name
+        self._invalidate_lut()
 
     def create_custom_preset(self, name: str, chars: str) -> None:
         """
@@ -121,12 +176,12 @@ class CharacterProcessor:
             ValueError: If name already exists or chars are invalid
         """
         name = name.upper()
-        if name in self._preset_styles:
+        if name in _PRESET_STYLES or name in self._custom_presets:
             raise ValueError(f"Preset '{name}' already exists")
         
         processed_chars = self._process_custom_chars(chars)
         validate_chars(processed_chars, self.MIN_CHARS, self.MAX_CHARS)
-        self._preset_styles[name] = processed_chars
+        self._custom_presets[name] = processed_chars
 
     def get_char_info(self) -> dict:
         """Get information about current character set."""
@@ -134,7 +189,7 @@ class CharacterProcessor:
             'current_chars': self._chars,
             'char_count': len(self._chars),
             'original_input': self._original_input,
-            'is_preset': self._original_input in self._preset_styles if self._original_input else False,
+            'is_preset': self._get_preset(self._original_input) is not None if self._original_input else False,
             'contains_spaces': ' ' in self._chars,
             'contains_special': any(not c.isalnum() for c in self._chars)
         }
@@ -151,6 +206,7 @@ class CharacterProcessor:
     def reverse_chars(self) -> None:
         """Reverse the current character set order."""
         self._chars.reverse()
+        self._invalidate_lut()
 
     def sort_chars(self, reverse: bool = False) -> None:
         """
@@ -160,10 +216,12 @@ class CharacterProcessor:
             reverse: Sort in reverse order if True
         """
         self._chars.sort(reverse=reverse)
+        self._invalidate_lut()
 
     def remove_spaces(self) -> None:
         """Remove spaces from the character set."""
         self._chars = [c for c in self._chars if not c.isspace()]
+        self._invalidate_lut()
 
     def add_chars(self, new_chars: str) -> None:
         """
@@ -176,9 +234,11 @@ class CharacterProcessor:
             ValueError: If resulting set would exceed MAX_CHARS
         """
         processed = self._process_custom_chars(new_chars)
-        combined = self._chars + [c for c in processed if c not in self._chars]
+        existing = set(self._chars)
+        combined = self._chars + [c for c in processed if c not in existing]
         
         if len(combined) > self.MAX_CHARS:
             raise ValueError(f"Adding these characters would exceed the maximum of {self.MAX_CHARS}")
             
         self._chars = combined
+        self._invalidate_lut()
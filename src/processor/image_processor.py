@@ -1,20 +1,80 @@
+import PIL
 from PIL import Image
-from rembg import remove
 import numpy as np
-import io
 from typing import Optional, Tuple, Union, List, Generator
 from pathlib import Path
 from ..utils.validators import validate_image_path
-from .char_processor import CharacterProcessor
+from .char_processor import CharacterProcessor, gradient_indices
 
 from colorama import init, Fore, Back, Style
-import colorsys
 
 import time
 import os
+import sys
+import logging
+import threading
+from collections import deque
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+init()
+
+# NumPy stores str arrays as native-endian UTF-32
+_UTF32 = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'
+
+# Colors produced by _color_buckets, in bucket order
+_COLOR_NAMES = ('RED', 'YELLOW', 'GREEN', 'CYAN', 'BLUE', 'MAGENTA', 'WHITE', 'BLACK')
+
+# Modes supported by Image.reduce
+_REDUCIBLE_MODES = frozenset({'L', 'LA', 'RGB', 'RGBA', 'RGBa', 'La', 'CMYK', 'YCbCr', 'I', 'F'})
+
+# Modes Pillow can only resize with NEAREST, and what to expand them to
+# when another filter is asked for (P -> RGB drops transparency the same
+# way the later conversion to L would)
+_EXPAND_BEFORE_RESIZE = {'P': 'RGB', 'PA': 'RGBA', '1': 'L'}
+
+# Color bucket by [max channel (R, G, B), position within its sector
+# (below, middle, above)]
+_HUE_BUCKETS = np.array([
+    [5, 0, 1],  # red max: MAGENTA, RED, YELLOW
+    [1, 2, 3],  # green max: YELLOW, GREEN, CYAN
+    [3, 4, 5],  # blue max: CYAN, BLUE, MAGENTA
+])
+
+# ANSI escape prefix per color bucket for each color mode, so coloring a
+# frame is a single gather from these tables
+_FG_ESCAPES = [getattr(Fore, name) for name in _COLOR_NAMES]
+_BG_ESCAPES = [getattr(Back, name) for name in _COLOR_NAMES]
+_COLOR_PREFIXES = {
+    'foreground': np.array(_FG_ESCAPES),
+    'background': np.array(_BG_ESCAPES),
+    'both': np.array([fg + bg for fg, bg in zip(_FG_ESCAPES, _BG_ESCAPES)]),
+}
+
+# Pillow-SIMD releases are tagged with a ".postN" version suffix
+if '.post' in PIL.__version__:
+    logger.info(f"Pillow-SIMD {PIL.__version__} detected")
+
+@lru_cache(maxsize=32)
+def _brightness_lut(chars: Tuple[str, ...]) -> np.ndarray:
+    """
+    Build the luminance -> character table for a character set.
 
+    One entry per possible 8-bit value, so a whole image maps with a single
+    gather. Cached because every frame of a GIF uses the same characters.
+    """
+    lut = np.array(chars)[gradient_indices(len(chars))]
+    lut.setflags(write=False)
+    return lut
 
-init(convert=True)
+@lru_cache(maxsize=32)
+def _pattern_row(chars: Tuple[str, ...], width: int) -> np.ndarray:
+    """Build one row of repeating characters for pattern mode."""
+    row = np.tile(np.array(chars), width // len(chars) + 1)[:width]
+    row.setflags(write=False)
+    return row
 
 class ImageProcessor:
     """
@@ -24,17 +84,20 @@ class ImageProcessor:
         char_processor (CharacterProcessor): Handles ASCII character sets
         _width (int): Default width for ASCII art output
         _image_formats (set): Supported image formats
+        _rembg_model (str): rembg model used for background removal
     """
 
-    def __init__(self):
+    def __init__(self, rembg_model: str = 'u2net'):
+        """
+        Args:
+            rembg_model: rembg model name; 'u2netp' and 'silueta' are lighter
+                and faster alternatives to the default 'u2net'
+        """
         self._width = 100
         self._default_chars = ["@", "#", "S", "%", "?", "*", "+", ";", ":", ",", "."]
-        self._color_modes = {
-            'none': self._no_color,
-            'foreground': self._foreground_color,
-            'background': self._background_color,
-            'both': self._both_color
-        }
+        self._rembg_model = rembg_model
+        self._rembg_session = None
+        self._rembg_lock = threading.Lock()
 
     def image_to_ascii(
         self,
@@ -44,42 +107,70 @@ class ImageProcessor:
         pattern_mode: bool = False,
         color_mode: str = 'none', 
         chars: Optional[List[str]] = None,
+        resample: Image.Resampling = Image.Resampling.NEAREST,
         **kwargs
     ) -> str:
         width = width or self._width
-        chars = chars or self._default_chars
 
-        # Load image
-        image = Image.open(image_path)
-        original_color = image.convert('RGB')
+        # Load image; the context closes the file as soon as it is decoded
+        with Image.open(image_path) as image:
+            if image.format == 'JPEG':
+                # Let libjpeg downscale by 1/2, 1/4 or 1/8 while decoding
+                image.draft('RGB', (width * 8, width * 8))
+
+            return self._ascii_from_pil(
+                image,
+                width=width,
+                remove_bg=remove_bg,
+                pattern_mode=pattern_mode,
+                color_mode=color_mode,
+                chars=chars,
+                resample=resample
+            )
+
+    def _ascii_from_pil(
+        self,
+        image: Image.Image,
+        width: Optional[int] = None,
+        remove_bg: bool = False,
+        pattern_mode: bool = False,
+        color_mode: str = 'none',
+        chars: Optional[List[str]] = None,
+        resample: Image.Resampling = Image.Resampling.NEAREST
+    ) -> str:
+        """Convert an already opened image to ASCII art."""
+        width = width or self._width
+        chars = chars or self._default_chars
 
         if remove_bg:
             # Get both the image without background and the alpha mask
             no_bg_image, alpha_mask = self._remove_background(image)
             
             # Resize both
-            no_bg_image = self._resize_image(no_bg_image, width)
-            alpha_mask = self._resize_image(alpha_mask, width)
+            no_bg_image = self._resize_image(no_bg_image, width, resample)
+            alpha_mask = self._resize_image(alpha_mask, width, resample)
             
-            # for color mode
-            original_color = self._resize_image(original_color, width)
+            # for color mode; converted after resizing so only the small
+            # image is copied
+            original_color = self._resize_image(image, width, resample).convert('RGB')
 
-            # Convert image to grayscale
-            grayscale_image = self._to_grayscale(no_bg_image)
+            # Convert image to grayscale; the mask already blanks the
+            # background, so there is no need to flatten onto white
+            grayscale_image = self._to_grayscale(no_bg_image, flatten_alpha=False)
             
             # Convert to ASCII using the alpha mask
-            return self._convert_to_ascii_with_mask(
+            return self._convert_to_ascii(
                 grayscale_image, 
-                alpha_mask, 
                 chars, 
                 pattern_mode,
                 original_color,
-                color_mode
+                color_mode,
+                mask=alpha_mask
             )
         else:
             # Regular processing without background removal
-            image = self._resize_image(image, width)
-            original_color = self._resize_image(original_color, width)
+            image = self._resize_image(image, width, resample)
+            original_color = image.convert('RGB')
             grayscale_image = self._to_grayscale(image)
             return self._convert_to_ascii(
                 grayscale_image, 
@@ -94,14 +185,21 @@ class ImageProcessor:
         Remove background and return both the processed image and alpha mask.
         """
         try:
-            # Convert PIL Image to bytes
-            img_byte_arr = io.BytesIO()
-            image.save(img_byte_arr, format=image.format or 'PNG')
-            img_byte_arr = img_byte_arr.getvalue()
-
-            # Remove background
-            output = remove(img_byte_arr)
-            no_bg_image = Image.open(io.BytesIO(output))
+            # rembg loads onnxruntime on import, so only pay for it when needed
+            from rembg import remove, new_session
+
+            # Loading the model is far more expensive than running it, so
+            # keep one session for every image/frame this processor handles
+            # GIF frames are converted on a thread pool, so only let one
+            # worker create the session
+            if self._rembg_session is None:
+                with self._rembg_lock:
+                    if self._rembg_session is None:
+                        self._rembg_session = new_session(self._rembg_model)
+
+            # Remove background; rembg accepts and returns PIL images
+            # directly, so no PNG encode/decode round-trip is needed
+            no_bg_image = remove(image, session=self._rembg_session)
             
             # Extract alpha channel as mask
             # If image is RGBA, use alpha channel; if RGB, create all-white mask
@@ -115,15 +213,46 @@ class ImageProcessor:
             print(f"Warning: Background removal failed: {e}")
             return image, Image.new('L', image.size, 255)
 
-    def _resize_image(self, image: Image.Image, width: int) -> Image.Image:
-        """Resize image maintaining aspect ratio."""
+    def _resize_image(
+        self,
+        image: Image.Image,
+        width: int,
+        resample: Image.Resampling = Image.Resampling.NEAREST
+    ) -> Image.Image:
+        """
+        Resize image maintaining aspect ratio.
+
+        Each output pixel becomes one character, so sub-character detail is
+        invisible and NEAREST is used by default instead of Pillow's
+        bicubic filter. Pass BILINEAR/LANCZOS for smoother gradients.
+
+        Pillow only resizes palette and bilevel images with NEAREST, so
+        those are expanded first when another filter is requested.
+        """
+        if resample != Image.Resampling.NEAREST and image.mode in _EXPAND_BEFORE_RESIZE:
+            image = image.convert(_EXPAND_BEFORE_RESIZE[image.mode])
+
         aspect_ratio = image.height / image.width
         height = int(aspect_ratio * width * 0.5)  # 0.5 to account for terminal character spacing
-        return image.resize((width, height))
 
-    def _to_grayscale(self, image: Image.Image) -> Image.Image:
-        """Convert image to grayscale."""
-        if image.mode == 'RGBA':
+        # Box-reduce by a whole factor first so the final resize only sees a
+        # few times more pixels than the output (palette modes can't reduce)
+        factor = min(image.width // width, image.height // max(height, 1))
+        if factor > 1 and image.mode in _REDUCIBLE_MODES:
+            image = image.reduce(factor)
+
+        return image.resize((width, height), resample)
+
+    def _to_grayscale(self, image: Image.Image, flatten_alpha: bool = True) -> Image.Image:
+        """
+        Convert image to grayscale.
+
+        Args:
+            image: Image to convert
+            flatten_alpha: Composite RGBA images onto white first so that
+                transparent areas come out light
+        """
+        if flatten_alpha and image.mode == 'RGBA':
             # Convert RGBA to RGB before grayscale conversion
             background = Image.new('RGB', image.size, (255, 255, 255))
             background.paste(image, mask=image.split()[3])  # Use alpha channel as mask
@@ -136,116 +265,137 @@ class ImageProcessor:
         chars: List[str],
         pattern_mode: bool,
         color_image: Image.Image,
-        color_mode: str = 'none'
+        color_mode: str = 'none',
+        mask: Optional[Image.Image] = None
     ) -> str:
-        """Convert grayscale image to ASCII art without background removal."""
-        pixels = np.array(image)
-        color_pixels = np.array(color_image)
-        ascii_str = []
-        
-        for row_idx, row in enumerate(pixels):
-            ascii_row = []
-            for col_idx, pixel in enumerate(row):
-                # Get character
-                if pattern_mode:
-                    char = chars[col_idx % len(chars)]
-                else:
-                    intensity_levels = 255 / (len(chars) - 1)
-                    char_index = int(pixel / intensity_levels)
-                    char = chars[char_index]
-
-                # Get color
-                rgb = color_pixels[row_idx][col_idx]
-                colored_char = self._color_modes[color_mode](char, rgb)
-                ascii_row.append(colored_char)
-
-            ascii_str.append(''.join(ascii_row))
-        
-        return '\n'.join(ascii_str) + Style.RESET_ALL
-
-    def _convert_to_ascii_with_mask(
+        """
+        Convert grayscale image to ASCII art.
+
+        Args:
+            image: Grayscale image
+            chars: Characters ordered from dark to light
+            pattern_mode: Repeat characters instead of mapping brightness
+            color_image: RGB image used for coloring
+            color_mode: Color mode for ASCII art
+            mask: Optional alpha mask; pixels below 128 are rendered as blank
+                background
+        """
+        pixels, color_pixels, mask_pixels = self._as_arrays(image, color_image, mask)
+        char_grid = self._char_grid(pixels, chars, pattern_mode)
+        char_grid = self._colorize(char_grid, color_pixels, color_mode)
+
+        if mask_pixels is not None:
+            # Background cells are blank; with colors on, reset first so the
+            # previous cell's color doesn't bleed into them
+            blank = ' ' if color_mode == 'none' else Style.RESET_ALL + ' '
+            # High bit set is the same as alpha >= 128
+            foreground = (mask_pixels & 0x80).astype(bool)
+            char_grid = np.where(foreground, char_grid, blank)
+
+        return self._join_grid(char_grid) + Style.RESET_ALL
+
+    def _join_grid(self, char_grid: np.ndarray) -> str:
+        """
+        Join a 2-D array of cell strings into newline-separated rows.
+
+        The grid plus a newline column is decoded from its raw UTF-32
+        buffer in one step instead of building a Python string per cell.
+        NumPy NUL-pads cells shorter than the widest one, so the pads are
+        stripped afterwards.
+        """
+        newlines = np.full((char_grid.shape[0], 1), '\n')
+        rows = np.concatenate([char_grid, newlines], axis=1)
+        return rows.tobytes().decode(_UTF32).replace('\x00', '')[:-1]
+
+    def _as_arrays(
         self,
         image: Image.Image,
-        mask: Image.Image,
-        chars: List[str],
-        pattern_mode: bool,
         color_image: Image.Image,
-        color_mode: str = 'none'
-    ) -> str:
-        """Convert grayscale image to ASCII art using alpha mask for background."""
-        pixels = np.array(image)
-        mask_pixels = np.array(mask)
-        color_pixels = np.array(color_image)
-        ascii_str = []
-
-        for row_idx, row in enumerate(pixels):
-            ascii_row = []
-            for col_idx, pixel in enumerate(row):
-                if mask_pixels[row_idx][col_idx] < 128:  # Background
-                    ascii_row.append(' ')
-                else:
-                    # Get character based on mode
-                    if pattern_mode:
-                        char = chars[col_idx % len(chars)]
-                    else:
-                        intensity_levels = 255 / (len(chars) - 1)
-                        char_index = int(pixel / intensity_levels)
-                        char = chars[char_index]
-
-                    # Apply color
-                    rgb = color_pixels[row_idx][col_idx]
-                    colored_char = self._color_modes[color_mode](char, rgb)
-                    ascii_row.append(colored_char)
-
-            ascii_str.append(''.join(ascii_row))
-
-        return '\n'.join(ascii_str) + Style.RESET_ALL
+        mask: Optional[Image.Image] = None
+    ) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """
+        Convert the grayscale, color and mask images to uint8 arrays.
 
-    
-    def _rgb_to_ansi(self, r: int, g: int, b: int) -> str:
-        """Convert RGB to closest ANSI color code."""
-        # Convert RGB to HSV
-        h, s, v = colorsys.rgb_to_hsv(r/255, g/255, b/255)
-        
-        # Simple color matching
-        if s < 0.2:
-            if v < 0.5:
-                return Fore.WHITE
-            return Fore.BLACK
-        
-        h *= 360
-        if h < 30:
-            return Fore.RED
-        elif h < 90:
-            return Fore.YELLOW
-        elif h < 150:
-            return Fore.GREEN
-        elif h < 210:
-            return Fore.CYAN
-        elif h < 270:
-            return Fore.BLUE
-        elif h < 330:
-            return Fore.MAGENTA
-        else:
-            return Fore.RED
+        Returns:
+            Tuple of (grayscale, RGB, mask) arrays; mask is None if not given
+        """
+        gray_u8 = np.asarray(image, dtype=np.uint8)
+        color_u8 = np.asarray(color_image, dtype=np.uint8)
+        mask_u8 = np.asarray(mask, dtype=np.uint8) if mask is not None else None
+        return gray_u8, color_u8, mask_u8
 
-    def _no_color(self, char: str, rgb: tuple) -> str:
-        """Return character without color."""
-        return char
+    def _char_grid(self, pixels: np.ndarray, chars: List[str], pattern_mode: bool) -> np.ndarray:
+        """
+        Map a grayscale pixel array to a 2-D array of characters.
+
+        Args:
+            pixels: Grayscale pixel values (0-255)
+            chars: Characters ordered from dark to light
+            pattern_mode: Repeat the characters across each row instead of
+                mapping brightness
 
-    def _foreground_color(self, char: str, rgb: tuple) -> str:
-        """Apply foreground color to character."""
-        return f"{self._rgb_to_ansi(*rgb)}{char}"
+        Returns:
+            np.ndarray: Character array with the same shape as `pixels`
+        """
+        if pattern_mode:
+            pattern_row = _pattern_row(tuple(chars), pixels.shape[1])
+            return np.broadcast_to(pattern_row, pixels.shape)
 
-    def _background_color(self, char: str, rgb: tuple) -> str:
-        """Apply background color to character."""
-        return f"{self._rgb_to_ansi(*rgb).replace('Fore', 'Back')}{char}"
+        return _brightness_lut(tuple(chars))[pixels]
 
-    def _both_color(self, char: str, rgb: tuple) -> str:
-        """Apply both foreground and background color."""
-        fg = self._rgb_to_ansi(*rgb)
-        bg = fg.replace('Fore', 'Back')
-        return f"{fg}{bg}{char}"
+    def _color_buckets(self, color_pixels: np.ndarray) -> np.ndarray:
+        """
+        Classify RGB pixels into the eight ANSI colors of `_COLOR_NAMES`.
+
+        Low-saturation pixels map to WHITE (dark) or BLACK (bright); the
+        rest are binned by hue in 60 degree sectors centred on each color.
+        Equivalent to thresholding colorsys.rgb_to_hsv, but done with
+        integer comparisons only.
+        """
+        # Split into contiguous channel planes once; every step below then
+        # streams through one plane at a time instead of striding over the
+        # interleaved RGB triples (and avoids slow reductions over axis=-1)
+        r, g, b = np.moveaxis(color_pixels, -1, 0).astype(np.int16, order='C')
+        maxc = np.maximum(np.maximum(r, g), b)
+        delta = maxc - np.minimum(np.minimum(r, g), b)
+
+        # saturation < 0.2  <=>  5 * delta < max (black has saturation 0)
+        low_sat = (5 * delta < maxc) | (maxc == 0)
+        # value < 0.5  <=>  2 * max < 255
+        gray_bucket = np.where(2 * maxc < 255, 6, 7)
+
+        # The hue lies within +-60 degrees of the max channel; the offset
+        # from it is (g - b), (b - r) or (r - g) in units of delta. Compare
+        # twice the offset against +-delta to land on a 30 degree boundary.
+        sector = np.where(r == maxc, 0, np.where(g == maxc, 1, 2))
+        offset = np.choose(sector, [g - b, b - r, r - g]) * 2
+        position = 1 - (offset < -delta).astype(np.int8) + (offset >= delta).astype(np.int8)
+        hue_bucket = _HUE_BUCKETS[sector, position]
+
+        return np.where(low_sat, gray_bucket, hue_bucket)
+
+    def _colorize(self, char_grid: np.ndarray, color_pixels: np.ndarray, color_mode: str) -> np.ndarray:
+        """
+        Prefix every character with the ANSI escape for its pixel color.
+
+        Args:
+            char_grid: Character array from `_char_grid`
+            color_pixels: RGB pixel array with the same height and width
+            color_mode: One of 'none', 'foreground', 'background', 'both'
+
+        Returns:
+            np.ndarray: Array of (possibly escaped) cell strings
+
+        Raises:
+            ValueError: If color mode is unknown
+        """
+        if color_mode == 'none':
+            return char_grid
+        if color_mode not in _COLOR_PREFIXES:
+            raise ValueError(f"Unsupported color mode: {color_mode}")
+
+        prefixes = _COLOR_PREFIXES[color_mode][self._color_buckets(color_pixels)]
+        return np.char.add(prefixes, char_grid)
     
     def process_gif(
         self,
@@ -255,10 +405,15 @@ class ImageProcessor:
         chars: Optional[List[str]] = None,
         pattern_mode: bool = False,
         color_mode: str = 'none',
+        resample: Image.Resampling = Image.Resampling.NEAREST,
         **kwargs
     ) -> Generator[str, None, None]:
         """
         Process GIF and yield ASCII frames.
+
+        Frames are decoded in order on the calling thread (GIF frames build
+        on each other), while the conversion of each decoded frame runs on
+        a thread pool. Frames are still yielded in their original order.
         """
         with Image.open(image_path) as gif:
             # Check if image is animated
@@ -273,33 +428,37 @@ class ImageProcessor:
                     remove_bg=remove_bg,
                     chars=chars,
                     pattern_mode=pattern_mode,
-                    color_mode=color_mode
+                    color_mode=color_mode,
+                    resample=resample
                 )
                 return
+            max_workers = os.cpu_count() or 1
             try:
-                for frame in range(frames):
-                    gif.seek(frame)
-                    # Convert frame to RGB
-                    rgb_frame = gif.convert('RGB')
-                    
-                    # Save frame temporarily
-                    temp_path = f"temp_frame_{frame}.png"
-                    rgb_frame.save(temp_path)
-                    
-                    # Process frame
-                    ascii_frame = self.image_to_ascii(
-                        temp_path,
-                        width=width,
-                        remove_bg=remove_bg,
-                        chars=chars,
-                        pattern_mode=pattern_mode,
-                        color_mode=color_mode
-                    )
-                    
-                    # Clean up temp file
-                    os.remove(temp_path)
-                    
-                    yield ascii_frame
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    pending = deque()
+                    for frame in range(frames):
+                        gif.seek(frame)
+                        # Convert frame to RGB
+                        rgb_frame = gif.convert('RGB')
+
+                        # Process the frame in memory
+                        pending.append(executor.submit(
+                            self._ascii_from_pil,
+                            rgb_frame,
+                            width=width,
+                            remove_bg=remove_bg,
+                            chars=chars,
+                            pattern_mode=pattern_mode,
+                            color_mode=color_mode,
+                            resample=resample
+                        ))
+
+                        # Keep at most one frame in flight per worker
+                        if len(pending) >= max_workers:
+                            yield pending.popleft().result()
+
+                    while pending:
+                        yield pending.popleft().result()
 
             except Exception as e:
                 print(f"Error processing GIF frame: {e}")
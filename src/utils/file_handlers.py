@@ -1,19 +1,96 @@
-from typing import Union, Optional, List, BinaryIO
+from typing import Union, Optional, List, BinaryIO, Sequence, Tuple
 from pathlib import Path
+from types import MappingProxyType
 import os
+import mmap
+import time
 import shutil
 import json
 import pickle
 from datetime import datetime
+import msgpack
+try:
+    import orjson
+except ImportError:
+    orjson = None
+import zstandard as zstd
 from PIL import Image
 import io
 import logging
-from ..utils.validators import validate_output_path, validate_image_path
+from concurrent.futures import ThreadPoolExecutor
+from ..config.settings import json_default
+from ..utils.validators import validate_output_path, validate_image_path, ALLOWED_EXTENSIONS
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Pickle protocol 2+ streams start with the PROTO opcode. A lone 0x80 is
+# also a valid msgpack document (the empty map), so only longer payloads
+# are treated as legacy pickles.
+_PICKLE_PROTO = b'\x80'
+
+def _write_file(path: Union[str, Path], chunks: Sequence[bytes]) -> None:
+    """
+    Write byte chunks to a file, truncating it first.
+
+    The chunks go out in one gathered write where the platform has
+    os.writev; any remainder of a short write is finished with os.write.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        if hasattr(os, 'writev'):
+            written = os.writev(fd, chunks)
+            if written == sum(map(len, chunks)):
+                return
+            remaining = memoryview(b''.join(chunks))[written:]
+        else:
+            remaining = memoryview(b''.join(chunks))
+
+        while remaining:
+            remaining = remaining[os.write(fd, remaining):]
+    finally:
+        os.close(fd)
+
+def _meta_path(output_path: Union[str, Path]) -> str:
+    """Path of the metadata file saved next to an output: 'art.txt' -> 'art.meta.json'."""
+    return os.path.splitext(output_path)[0] + '.meta.json'
+
+# Fixed (header, footer) bytes written around the art for each export format
+_EXPORT_WRAPPERS = MappingProxyType({
+    'txt': (b"", b""),
+    'html': (b"<!DOCTYPE html>\n<html>\n<head><title>ASCII Art</title></head>\n<body><pre>",
+             b"</pre></body>\n</html>\n"),
+    'md': (b"```\n", b"\n```"),
+})
+
+# Magic number at the start of every zstd frame
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+# Reused across calls so each save/load doesn't build a new codec context
+_ZSTD_C = zstd.ZstdCompressor(level=3)
+_ZSTD_D = zstd.ZstdDecompressor()
+
+def _encode_ext(obj):
+    """Convert values msgpack can't serialize natively into strings."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, Path):
+        return str(obj)
+    raise TypeError(f"Cannot serialize object of type {type(obj).__name__}")
+
+# Project files smaller than this are read normally; mapping them costs
+# more than the copy it saves
+_MMAP_MIN_SIZE = 64 * 1024
+
+def _decode_project(payload, filepath: Union[str, Path]) -> dict:
+    """Decode a project file's contents (bytes or a mapped buffer)."""
+    if payload[:4] == _ZSTD_MAGIC:
+        payload = _ZSTD_D.decompress(payload)
+
+    if payload[:1] == _PICKLE_PROTO and len(payload) > 1:
+        logger.warning("Loading legacy pickle project %s; re-save it to convert", filepath)
+        return pickle.loads(payload)
+    return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+
 class FileHandler:
     """
     Handles file operations for the ASCII art generator.
@@ -21,13 +98,13 @@ class FileHandler:
     Attributes:
         output_dir (Path): Directory for output files
         temp_dir (Path): Directory for temporary files
-        supported_formats (set): Supported image formats
+        supported_formats (frozenset): Supported image file extensions
     """
 
     def __init__(self, output_dir: Union[str, Path] = "output", temp_dir: Union[str, Path] = "temp"):
         self.output_dir = Path(output_dir)
         self.temp_dir = Path(temp_dir)
-        self.supported_formats = {'.png', '.jpg', '.jpeg', '.gif', '.bmp'}
+        self.supported_formats = ALLOWED_EXTENSIONS
         
         # Create necessary directories
         self._initialize_directories()
@@ -54,25 +131,61 @@ class FileHandler:
         Returns:
             Path to the saved file
         """
-        output_path = self.output_dir / filename
-        validate_output_path(output_path)
-
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(ascii_art)
+            output_path = self._write_ascii_art(ascii_art, filename, metadata)
+            logger.info("ASCII art saved to %s", output_path)
+            return output_path
 
-            # Save metadata if provided
-            if metadata:
-                meta_path = output_path.with_suffix('.meta.json')
-                self.save_metadata(metadata, meta_path)
+        except Exception as e:
+            logger.error("Error saving ASCII art: %s", e)
+            raise
 
-            logger.info(f"ASCII art saved to {output_path}")
-            return output_path
+    def save_ascii_art_batch(
+        self,
+        items: Sequence[Tuple[str, Union[str, Path], Optional[dict]]],
+        max_workers: Optional[int] = None
+    ) -> List[Path]:
+        """
+        Save several ASCII art outputs in one call.
+
+        Each output is validated and written the same way as in
+        `save_ascii_art`; only the summary is logged. The files are
+        independent, so they are written concurrently on a thread pool.
+
+        Args:
+            items: (ascii_art, filename, metadata) tuples; metadata may be None
+            max_workers: Number of writer threads (ThreadPoolExecutor default if None)
+
+        Returns:
+            Paths to the saved files, in the order given
+        """
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                saved = list(executor.map(lambda item: self._write_ascii_art(*item), items))
+
+            logger.info("Saved %d ASCII art files to %s", len(saved), self.output_dir)
+            return saved
 
         except Exception as e:
-            logger.error(f"Error saving ASCII art: {e}")
+            logger.error("Error saving ASCII art batch: %s", e)
             raise
 
+    def _write_ascii_art(
+        self,
+        ascii_art: str,
+        filename: Union[str, Path],
+        metadata: Optional[dict] = None
+    ) -> Path:
+        """Validate the output path and write the art and its metadata (shared by single and batch saves)."""
+        output_path = self.output_dir / filename
+        validate_output_path(output_path)
+        _write_file(output_path, [ascii_art.encode('utf-8')])
+
+        # Save metadata if provided
+        if metadata:
+            self.save_metadata(metadata, _meta_path(output_path))
+        return output_path
+
     def load_image(self, image_path: Union[str, Path]) -> Image.Image:
         """
         Load and validate an image file.
@@ -90,7 +203,7 @@ class FileHandler:
             image = Image.open(image_path)
             return image
         except Exception as e:
-            logger.error(f"Error loading image: {e}")
+            logger.error("Error loading image: %s", e)
             raise
 
     def save_image(
@@ -115,42 +228,59 @@ class FileHandler:
 
         try:
             image.save(output_path, format=format)
-            logger.info(f"Image saved to {output_path}")
+            logger.info("Image saved to %s", output_path)
             return output_path
         except Exception as e:
-            logger.error(f"Error saving image: {e}")
+            logger.error("Error saving image: %s", e)
             raise
 
     def save_metadata(self, metadata: dict, filepath: Union[str, Path]) -> None:
-        """Save metadata to JSON file."""
+        """Save metadata to JSON file, using orjson when available."""
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=4)
-            logger.info(f"Metadata saved to {filepath}")
+            if orjson is not None:
+                data = orjson.dumps(
+                    metadata,
+                    default=json_default,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                )
+            else:
+                # Match orjson's output: 2-space indent (its only option) and UTF-8
+                data = json.dumps(
+                    metadata, indent=2, ensure_ascii=False, default=json_default
+                ).encode('utf-8')
+            _write_file(filepath, [data])
+            logger.info("Metadata saved to %s", filepath)
         except Exception as e:
-            logger.error(f"Error saving metadata: {e}")
+            logger.error("Error saving metadata: %s", e)
             raise
 
-    def create_backup(self, filepath: Union[str, Path]) -> Path:
+    def create_backup(self, filepath: Union[str, Path], preserve_meta: bool = False) -> Path:
         """
         Create a backup of a file.
 
         Args:
             filepath: Path to the file to backup
+            preserve_meta: Also copy permission bits and timestamps
 
         Returns:
             Path to the backup file
         """
-        filepath = Path(filepath)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_path = filepath.with_name(f"{filepath.stem}_backup_{timestamp}{filepath.suffix}")
+        # Split the name once and build the backup name as a plain string
+        head, name = os.path.split(filepath)
+        stem, suffix = os.path.splitext(name)
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        backup_path = Path(head, f"{stem}_backup_{timestamp}{suffix}")
 
         try:
-            shutil.copy2(filepath, backup_path)
-            logger.info(f"Backup created at {backup_path}")
+            # copyfile copies only the contents, which lets it use the
+            # kernel's zero-copy path; copystat is opt-in
+            shutil.copyfile(filepath, backup_path)
+            if preserve_meta:
+                shutil.copystat(filepath, backup_path)
+            logger.info("Backup created at %s", backup_path)
             return backup_path
         except Exception as e:
-            logger.error(f"Error creating backup: {e}")
+            logger.error("Error creating backup: %s", e)
             raise
 
     def cleanup_temp_files(self, max_age_hours: int = 24) -> None:
@@ -160,17 +290,18 @@ class FileHandler:
         Args:
             max_age_hours: Maximum age of files in hours
         """
-        current_time = datetime.now().timestamp()
+        cutoff = time.time() - max_age_hours * 3600
         
         try:
-            for file_path in self.temp_dir.glob('*'):
-                if file_path.is_file():
-                    file_age = current_time - file_path.stat().st_mtime
-                    if file_age > max_age_hours * 3600:
-                        file_path.unlink()
-                        logger.info(f"Deleted old temp file: {file_path}")
+            # scandir hands back the file type from the directory listing and
+            # caches the stat result, so each entry costs a single stat call
+            with os.scandir(self.temp_dir) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False) and entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                        os.unlink(entry.path)
+                        logger.info("Deleted old temp file: %s", entry.path)
         except Exception as e:
-            logger.error(f"Error during cleanup: {e}")
+            logger.error("Error during cleanup: %s", e)
 
     def save_project(
         self,
@@ -180,6 +311,8 @@ class FileHandler:
         """
         Save project data including ASCII art and settings.
 
+        The data is stored as zstd-compressed msgpack.
+
         Args:
             project_data: Dictionary containing project data
             filename: Output filename
@@ -190,18 +323,25 @@ class FileHandler:
         output_path = self.output_dir / filename
         
         try:
+            payload = msgpack.packb(project_data, use_bin_type=True, default=_encode_ext)
+            # Stream into the file so the compressed copy is never held in
+            # memory alongside the payload
             with open(output_path, 'wb') as f:
-                pickle.dump(project_data, f)
-            logger.info(f"Project saved to {output_path}")
+                with _ZSTD_C.stream_writer(f, size=len(payload), closefd=False) as writer:
+                    writer.write(payload)
+            logger.info("Project saved to %s", output_path)
             return output_path
         except Exception as e:
-            logger.error(f"Error saving project: {e}")
+            logger.error("Error saving project: %s", e)
             raise
 
     def load_project(self, filepath: Union[str, Path]) -> dict:
         """
         Load a saved project.
 
+        Projects saved by older versions as pickles are still read, but only
+        load those from sources you trust.
+
         Args:
             filepath: Path to the project file
 
@@ -210,11 +350,17 @@ class FileHandler:
         """
         try:
             with open(filepath, 'rb') as f:
-                project_data = pickle.load(f)
-            logger.info(f"Project loaded from {filepath}")
+                if os.fstat(f.fileno()).st_size < _MMAP_MIN_SIZE:
+                    project_data = _decode_project(f.read(), filepath)
+                else:
+                    # Map large files instead of reading them, so the decoders
+                    # work on the page cache directly rather than a private copy
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        project_data = _decode_project(mapped, filepath)
+            logger.info("Project loaded from %s", filepath)
             return project_data
         except Exception as e:
-            logger.error(f"Error loading project: {e}")
+            logger.error("Error loading project: %s", e)
             raise
 
     def export_ascii_art(
@@ -237,30 +383,19 @@ class FileHandler:
         output_path = self.output_dir / f"{Path(filename).stem}.{format}"
         
         try:
-            if format == 'txt':
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(ascii_art)
-            elif format == 'html':
-                html_content = f"""
-                <!DOCTYPE html>
-                <html>
-                <head><title>ASCII Art</title></head>
-                <body><pre>{ascii_art}</pre></body>
-                </html>
-                """
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(html_content)
-            elif format == 'md':
-                md_content = f"```\n{ascii_art}\n```"
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(md_content)
-            else:
+            wrapper = _EXPORT_WRAPPERS.get(format)
+            if wrapper is None:
                 raise ValueError(f"Unsupported format: {format}")
 
-            logger.info(f"ASCII art exported to {output_path}")
+            # Write the art between the fixed header and footer rather than
+            # building a second copy of it inside a template string
+            header, footer = wrapper
+            _write_file(output_path, [header, ascii_art.encode('utf-8'), footer])
+
+            logger.info("ASCII art exported to %s", output_path)
             return output_path
         except Exception as e:
-            logger.error(f"Error exporting ASCII art: {e}")
+            logger.error("Error exporting ASCII art: %s", e)
             raise
 
     def get_file_info(self, filepath: Union[str, Path]) -> dict:
@@ -286,5 +421,5 @@ class FileHandler:
                 'path': str(filepath.absolute())
             }
         except Exception as e:
-            logger.error(f"Error getting file info: {e}")
+            logger.error("Error getting file info: %s", e)
             raise
\ No newline at end of file
@@ -1,28 +1,53 @@
-from typing import List, Union, Optional
+from typing import Dict, List, Union, Optional
 from pathlib import Path
 import os
+import stat
 import string
-import imghdr
-from PIL import Image
+import time
+
+# Image file extensions accepted for input, shared with FileHandler
+ALLOWED_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.gif', '.bmp'})
+
+# Set form of string.printable for constant-time membership tests
+_PRINTABLE = frozenset(string.printable)
+
+# Images that passed validate_image_path, keyed on the path, its mtime and
+# size and the check parameters, with the monotonic time they were checked.
+# A modified file gets a new key, so stale entries are never hit.
+_VALIDATED: Dict[tuple, float] = {}
+_VALIDATED_MAX = 256
+_VALIDATION_TTL = 60.0
 
 class ValidationError(Exception):
     """Custom exception for validation errors."""
     pass
 
+def _safe_stat(path: Union[str, Path]) -> Optional[os.stat_result]:
+    """Stat a path once, returning None if it doesn't exist."""
+    try:
+        return os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
 def validate_image_path(
     path: Union[str, Path],
     min_size: tuple = (10, 10),
     max_size: tuple = (10000, 10000),
-    allowed_formats: Optional[set] = None
+    allowed_formats: Optional[set] = None,
+    verify: bool = False
 ) -> None:
     """
     Validate image path and basic image properties.
 
+    Only the image header is parsed. Corrupt pixel data is reported when the
+    image is decoded for conversion, unless `verify` asks for a full check.
+
     Args:
         path: Path to the image file
         min_size: Minimum allowed image dimensions (width, height)
         max_size: Maximum allowed image dimensions (width, height)
         allowed_formats: Set of allowed image formats (e.g., {'jpeg', 'png'})
+        verify: Also check the image data for corruption (reads the whole file)
 
     Raises:
         ValidationError: If any validation check fails
@@ -31,22 +56,32 @@ def validate_image_path(
     # Convert string path to Path object
     path = Path(path) if isinstance(path, str) else path
 
-    # Check if file exists
-    if not path.exists():
+    # Check if file exists and is a regular file, with a single stat call
+    st = _safe_stat(path)
+    if st is None:
         raise FileNotFoundError(f"Image file not found: {path}")
 
-    # Check if it's a file
-    if not path.is_file():
+    if not stat.S_ISREG(st.st_mode):
         raise ValidationError(f"Path is not a file: {path}")
 
     # Check file extension
-    if path.suffix.lower() not in {'.png', '.jpg', '.jpeg', '.gif', '.bmp'}:
+    if path.suffix.lower() not in ALLOWED_EXTENSIONS:
         raise ValidationError(f"Unsupported file extension: {path.suffix}")
 
-    # Verify it's actually an image file
-    if not imghdr.what(path):
-        raise ValidationError(f"File is not a valid image: {path}")
+    # Skip opening the image if this exact file passed the same checks recently
+    key = (
+        os.fspath(path), st.st_mtime_ns, st.st_size, tuple(min_size), tuple(max_size),
+        frozenset(allowed_formats) if allowed_formats else None, verify
+    )
+    checked_at = _VALIDATED.get(key)
+    if checked_at is not None and time.monotonic() - checked_at < _VALIDATION_TTL:
+        return
+
+    # Imported here so that importing this module (e.g. for ValidationError
+    # in the CLI) doesn't load Pillow
+    from PIL import Image
 
+    # Opening only parses the header; Pillow rejects non-image files here
     try:
         with Image.open(path) as img:
             # Check image format
@@ -67,11 +102,20 @@ def validate_image_path(
                 )
 
             # Check if image can be read
-            img.verify()
+            if verify:
+                img.verify()
 
     except (IOError, SyntaxError) as e:
         raise ValidationError(f"Invalid or corrupted image file: {e}")
 
+    # Drop any expired entry for this key first, so refreshing it never
+    # evicts an unrelated entry
+    _VALIDATED.pop(key, None)
+    if len(_VALIDATED) >= _VALIDATED_MAX:
+        # Evict the oldest entry (dicts keep insertion order)
+        _VALIDATED.pop(next(iter(_VALIDATED)), None)
+    _VALIDATED[key] = time.monotonic()
+
 def validate_chars(
     chars: List[str],
     min_chars: int = 2,
@@ -105,21 +149,19 @@ def validate_chars(
             f"Maximum {max_chars} characters allowed. Got {len(chars)}"
         )
 
-    # Check for empty characters
-    if '' in chars:
-        raise ValidationError("Empty character found in character set")
+    # Check every character in a single pass, stopping at the first failure
+    for c in chars:
+        if not c:
+            raise ValidationError("Empty character found in character set")
 
-    # Check for spaces if not allowed
-    if not allow_spaces and any(c.isspace() for c in chars):
-        raise ValidationError("Spaces are not allowed in character set")
+        if not allow_spaces and c.isspace():
+            raise ValidationError("Spaces are not allowed in character set")
 
-    # Check for special characters if not allowed
-    if not allow_special and any(not c.isalnum() for c in chars):
-        raise ValidationError("Special characters are not allowed in character set")
+        if not allow_special and not c.isalnum():
+            raise ValidationError("Special characters are not allowed in character set")
 
-    # Check for printable characters if required
-    if printable_only and any(c not in string.printable for c in chars):
-        raise ValidationError("Non-printable characters found in character set")
+        if printable_only and c not in _PRINTABLE:
+            raise ValidationError("Non-printable characters found in character set")
 
 def validate_output_path(
     path: Union[str, Path],
@@ -149,12 +191,13 @@ def validate_output_path(
 
     # Check if path is writable
     try:
-        if path.exists():
+        if _safe_stat(path) is not None:
             # Check if file can be written to
             if not os.access(path, os.W_OK):
                 raise ValidationError(f"Output file is not writable: {path}")
-        else:
-            # Try to create and remove a temporary file
+        elif not os.access(path.parent, os.W_OK):
+            # Confirm by trying to create and remove the file, since
+            # os.access can disagree with the effective permissions
             try:
                 path.touch()
                 path.unlink()
@@ -2,13 +2,25 @@ import pytest
 from pathlib import Path
 import shutil
 import tempfile
+import pickle
+import json
+import os
+import sys
+import time
+import types
+from datetime import datetime
 from PIL import Image
 import numpy as np
 
-from src.processor.image_processor import ImageProcessor
-from src.processor.char_processor import CharacterProcessor
+from colorama import Fore, Back, Style
+
+from src.processor.image_processor import ImageProcessor, _COLOR_NAMES
+from src.processor.char_processor import CharacterProcessor, gradient_indices
+from src.utils import file_handlers
 from src.utils.file_handlers import FileHandler
-from src.utils.validators import ValidationError
+from src.utils import validators
+from src.utils.validators import ValidationError, validate_image_path
+from src.config import settings
 from src.config.settings import SettingsManager
 
 # Fixtures
@@ -49,6 +61,13 @@ def settings_manager(temp_dir):
     """Create a SettingsManager instance with temporary config file."""
     return SettingsManager(config_path=temp_dir / "config.json")
 
+@pytest.fixture(autouse=True)
+def clear_validation_cache():
+    """Start every test without remembered image validations."""
+    validators._VALIDATED.clear()
+    yield
+    validators._VALIDATED.clear()
+
 # Image Processor Tests
 class TestImageProcessor:
     def test_init(self, image_processor):
@@ -82,6 +101,115 @@ class TestImageProcessor:
         first_line = ascii_art.split('\n')[0]
         assert len(first_line) == width
 
+    def test_background_color_mode(self, image_processor, sample_image):
+        """Test that background mode emits background escapes only."""
+        ascii_art = image_processor.image_to_ascii(sample_image, width=20, color_mode='background')
+        assert any(getattr(Back, name) in ascii_art for name in _COLOR_NAMES)
+        assert not any(getattr(Fore, name) in ascii_art for name in _COLOR_NAMES)
+
+    def test_both_color_mode(self, image_processor, sample_image):
+        """Test that 'both' mode emits foreground + background pairs."""
+        ascii_art = image_processor.image_to_ascii(sample_image, width=20, color_mode='both')
+        assert any(
+            getattr(Fore, name) + getattr(Back, name) in ascii_art for name in _COLOR_NAMES
+        )
+
+    def test_unknown_color_mode(self, image_processor, sample_image):
+        """Test that an unknown color mode is rejected."""
+        with pytest.raises(ValueError):
+            image_processor.image_to_ascii(sample_image, color_mode='rainbow')
+
+    @pytest.mark.parametrize("rgb, expected", [
+        ((164, 191, 137), 'GREEN'),    # hue exactly 90 degrees
+        ((188, 232, 235), 'CYAN'),     # saturation exactly 0.2
+        ((0, 0, 0), 'WHITE'),          # black has no saturation, low value
+        ((255, 255, 255), 'BLACK'),    # unsaturated, high value
+        ((255, 0, 0), 'RED'),
+        ((255, 255, 0), 'YELLOW'),
+        ((0, 255, 0), 'GREEN'),
+        ((0, 255, 255), 'CYAN'),
+        ((0, 0, 255), 'BLUE'),
+        ((255, 0, 255), 'MAGENTA'),
+    ])
+    def test_color_buckets(self, image_processor, rgb, expected):
+        """Test color classification, including exact threshold cases."""
+        pixels = np.array([[rgb]], dtype=np.uint8)
+        bucket = image_processor._color_buckets(pixels)[0, 0]
+        assert _COLOR_NAMES[bucket] == expected
+
+    @pytest.mark.parametrize("color_mode, blank", [
+        ('none', ' '),
+        ('background', Style.RESET_ALL + ' '),
+    ])
+    def test_masked_cells(self, image_processor, color_mode, blank):
+        """Test that masked-out cells are blank, resetting colors when on."""
+        gray = Image.new('L', (4, 2), 0)
+        color = Image.new('RGB', (4, 2), (255, 0, 0))
+        mask = Image.fromarray(np.array([[0, 0, 255, 255]] * 2, dtype=np.uint8))
+
+        ascii_art = image_processor._convert_to_ascii(
+            gray, ['@', '.'], False, color, color_mode, mask=mask
+        )
+        cell = '@' if color_mode == 'none' else Back.RED + '@'
+        row = blank * 2 + cell * 2
+        assert ascii_art == row + '\n' + row + Style.RESET_ALL
+
+    @pytest.mark.parametrize("mode", ['P', '1'])
+    def test_resample_palette_image(self, image_processor, mode):
+        """Test that a smoothing filter applies to palette and bilevel images."""
+        stripes = np.tile(np.array([0, 255], dtype=np.uint8), (40, 20))
+        image = Image.fromarray(stripes).convert(mode)
+
+        resized = image_processor._resize_image(image, 20, Image.Resampling.BILINEAR)
+        pixels = np.asarray(resized.convert('L'))
+        assert ((pixels > 0) & (pixels < 255)).any()
+
+        # NEAREST keeps the fast path and the original mode
+        assert image_processor._resize_image(image, 20).mode == mode
+
+    def test_gif_resample_forwarded(self, image_processor, temp_dir, monkeypatch):
+        """Test that process_gif passes the resampling filter to each frame."""
+        gif_path = temp_dir / "anim.gif"
+        frames = [Image.new('L', (40, 40), shade) for shade in (0, 128, 255)]
+        frames[0].save(gif_path, save_all=True, append_images=frames[1:])
+
+        used = []
+        resize = image_processor._resize_image
+
+        def record_resize(image, width, resample=Image.Resampling.NEAREST):
+            used.append(resample)
+            return resize(image, width, resample)
+
+        monkeypatch.setattr(image_processor, '_resize_image', record_resize)
+        list(image_processor.process_gif(gif_path, width=20, resample=Image.Resampling.LANCZOS))
+        assert used == [Image.Resampling.LANCZOS] * len(frames)
+
+    def test_rembg_session_created_once(self, image_processor, temp_dir, monkeypatch):
+        """Test that parallel GIF frames share a single rembg session."""
+        calls = []
+
+        def new_session(model):
+            calls.append(model)
+            time.sleep(0.05)  # widen the window for a racing worker
+            return object()
+
+        def remove(image, session=None):
+            return image.convert('RGBA')
+
+        rembg = types.ModuleType('rembg')
+        rembg.new_session = new_session
+        rembg.remove = remove
+        monkeypatch.setitem(sys.modules, 'rembg', rembg)
+        monkeypatch.setattr(os, 'cpu_count', lambda: 8)
+
+        gif_path = temp_dir / "anim.gif"
+        frames = [Image.new('L', (40, 40), shade) for shade in range(0, 240, 30)]
+        frames[0].save(gif_path, save_all=True, append_images=frames[1:])
+
+        results = list(image_processor.process_gif(gif_path, width=20, remove_bg=True))
+        assert len(results) == len(frames)
+        assert calls == ['u2net']
+
 # Character Processor Tests
 class TestCharacterProcessor:
     def test_init(self, char_processor):
@@ -107,6 +235,47 @@ class TestCharacterProcessor:
         processor = CharacterProcessor(test_chars)
         assert "".join(processor.get_chars()) == test_chars
 
+    def test_build_lut(self):
+        """Test luminance lookup table covers the full gradient."""
+        processor = CharacterProcessor("AB")
+        lut = processor.build_lut()
+        assert lut.shape == (256,)
+        assert chr(lut[0]) == "A"
+        assert chr(lut[255]) == "B"
+
+        processor.reverse_chars()
+        assert chr(processor.build_lut()[0]) == "B"
+
+    @pytest.mark.parametrize("n", [2, 11, 14, 27, 32, 50, 257, 300])
+    def test_gradient_indices_match_float_steps(self, n):
+        """Test the luminance mapping against the original float division."""
+        expected = [int(p / (255 / (n - 1))) for p in range(256)]
+        assert gradient_indices(n).tolist() == expected
+
+    def test_long_custom_chars(self, image_processor, temp_dir):
+        """Test that sets longer than 256 characters keep the whole ramp."""
+        white = temp_dir / "white.png"
+        Image.new('L', (40, 40), 255).save(white)
+        chars = [chr(0x4E00 + i) for i in range(300)]
+        ascii_art = image_processor.image_to_ascii(white, width=20, chars=chars)
+        assert set(ascii_art.replace('\n', '').replace(Style.RESET_ALL, '')) == {chars[-1]}
+
+    def test_apply_preset(self, char_processor):
+        """Test applying built-in and custom presets."""
+        char_processor.apply_preset("binary")
+        assert char_processor.get_chars() == ["1", "0"]
+        assert char_processor.get_char_info()['is_preset'] is True
+
+        char_processor.create_custom_preset("abc", "ABC")
+        char_processor.apply_preset("ABC")
+        assert char_processor.get_chars() == ["A", "B", "C"]
+        assert "ABC" not in CharacterProcessor().get_preset_names()
+
+    def test_default_chars_not_shared(self, char_processor):
+        """Test mutating one instance leaves the defaults untouched."""
+        char_processor.reverse_chars()
+        assert CharacterProcessor().get_chars() == CharacterProcessor.DEFAULT_CHARS
+
 # File Handler Tests
 class TestFileHandler:
     def test_init(self, file_handler, temp_dir):
@@ -131,6 +300,120 @@ class TestFileHandler:
         file_handler.save_ascii_art(ascii_art, output_path, metadata)
         assert output_path.with_suffix('.meta.json').exists()
 
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_metadata_types(self, file_handler, temp_dir, monkeypatch, use_orjson):
+        """Test that orjson and the stdlib fallback encode metadata alike."""
+        if not use_orjson:
+            monkeypatch.setattr(file_handlers, 'orjson', None)
+        metadata = {
+            "timestamp": datetime(2024, 1, 15, 13, 30, 5, 123456),
+            "source": temp_dir / "in.png",
+            "size": np.array([80, 40]),
+            "mean": np.float64(0.5),
+        }
+        path = temp_dir / "art.meta.json"
+        file_handler.save_metadata(metadata, path)
+        assert json.loads(path.read_text(encoding='utf-8')) == {
+            "timestamp": "2024-01-15T13:30:05.123456",
+            "source": str(temp_dir / "in.png"),
+            "size": [80, 40],
+            "mean": 0.5,
+        }
+
+    def test_metadata_same_bytes_without_orjson(self, file_handler, temp_dir, monkeypatch):
+        """Test that the stdlib fallback writes the same file as orjson."""
+        metadata = {"source": "in.png", "settings": {"width": 80, "chars": "█▓▒░"}, "tags": []}
+        file_handler.save_metadata(metadata, temp_dir / "fast.meta.json")
+        monkeypatch.setattr(file_handlers, 'orjson', None)
+        file_handler.save_metadata(metadata, temp_dir / "plain.meta.json")
+        assert (temp_dir / "fast.meta.json").read_bytes() == (temp_dir / "plain.meta.json").read_bytes()
+
+    def test_save_ascii_art_batch(self, file_handler, temp_dir):
+        """Test saving several ASCII arts in one call."""
+        items = [("@#.\n.#@", "a.txt", None), ("█▓▒░", "b.txt", {"test": "metadata"})]
+        paths = file_handler.save_ascii_art_batch(items)
+        assert paths == [temp_dir / "a.txt", temp_dir / "b.txt"]
+        assert paths[0].read_text(encoding='utf-8') == "@#.\n.#@"
+        assert paths[1].read_text(encoding='utf-8') == "█▓▒░"
+        assert (temp_dir / "b.meta.json").exists()
+
+    def test_large_project_round_trip(self, file_handler):
+        """Test loading a project big enough to be memory-mapped."""
+        project = {"ascii_art": os.urandom(64 * 1024).hex()}
+        path = file_handler.save_project(project, "large.bin")
+        assert path.stat().st_size >= 64 * 1024
+        assert file_handler.load_project(path) == project
+
+    def test_project_round_trip(self, file_handler, temp_dir):
+        """Test saving and loading a project, including legacy pickles."""
+        project = {"ascii_art": "@#.", "settings": {"width": 80}, "source": temp_dir / "in.png"}
+        path = file_handler.save_project(project, "project.bin")
+        assert path.read_bytes()[:4] == b'\x28\xb5\x2f\xfd'
+        loaded = file_handler.load_project(path)
+        assert loaded == {**project, "source": str(temp_dir / "in.png")}
+
+        legacy = temp_dir / "legacy.pkl"
+        legacy.write_bytes(pickle.dumps({"ascii_art": "@#."}))
+        assert file_handler.load_project(legacy) == {"ascii_art": "@#."}
+
+# Validator Tests
+class TestValidators:
+    def test_rejects_non_image(self, temp_dir):
+        """Test that a text file with an image extension is rejected."""
+        path = temp_dir / "notes.png"
+        path.write_text("not an image " * 20)
+        with pytest.raises(ValidationError):
+            validate_image_path(path)
+
+    def test_verify_truncated_image(self, temp_dir):
+        """Test that verify=True catches a truncated image."""
+        path = temp_dir / "truncated.png"
+        array = np.random.randint(0, 255, (100, 100), dtype=np.uint8)
+        Image.fromarray(array).save(path)
+        path.write_bytes(path.read_bytes()[:2000])
+
+        validate_image_path(path)  # header alone is still valid
+        with pytest.raises(ValidationError):
+            validate_image_path(path, verify=True)
+
+    def test_validation_cache_hit(self, sample_image, monkeypatch):
+        """Test that an unchanged, validated image isn't opened again."""
+        validate_image_path(sample_image)
+
+        def fail_open(*args, **kwargs):
+            raise AssertionError("image reopened")
+
+        monkeypatch.setattr(Image, 'open', fail_open)
+        validate_image_path(sample_image)
+
+    def test_validation_cache_invalidated_on_change(self, sample_image):
+        """Test that a modified file is validated again."""
+        validate_image_path(sample_image)
+        Image.new('L', (5, 5)).save(sample_image)
+        with pytest.raises(ValidationError):
+            validate_image_path(sample_image)
+
+    def test_validation_cache_eviction(self, sample_image):
+        """Test that the cache drops its oldest entry when full."""
+        validators._VALIDATED.update({('stale', i): 0.0 for i in range(validators._VALIDATED_MAX)})
+        validate_image_path(sample_image)
+        assert len(validators._VALIDATED) == validators._VALIDATED_MAX
+        assert ('stale', 0) not in validators._VALIDATED
+        assert ('stale', 1) in validators._VALIDATED
+
+    def test_validation_cache_refresh_keeps_others(self, sample_image, monkeypatch):
+        """Test that refreshing an expired entry in a full cache evicts nothing."""
+        stale = {('stale', i): 0.0 for i in range(validators._VALIDATED_MAX - 1)}
+        validators._VALIDATED.update(stale)
+        validate_image_path(sample_image)
+        key = next(reversed(validators._VALIDATED))
+        validators._VALIDATED[key] = -validators._VALIDATION_TTL  # expired
+
+        validate_image_path(sample_image)
+        assert len(validators._VALIDATED) == validators._VALIDATED_MAX
+        assert all(k in validators._VALIDATED for k in stale)
+        assert validators._VALIDATED[key] > 0
+
 # Settings Manager Tests
 class TestSettingsManager:
     def test_init(self, settings_manager):
@@ -159,6 +442,14 @@ class TestSettingsManager:
         new_settings = SettingsManager(config_path=temp_dir / "config.json")
         assert new_settings.get_ascii_art_settings().width == 200
 
+    def test_settings_json_without_orjson(self, settings_manager, monkeypatch):
+        """Test that the stdlib fallback writes the same bytes as orjson."""
+        data = {"saved": datetime(2024, 1, 1), "dir": Path("output"), "chars": "█▓"}
+        fast = settings._dumps_json(data)
+        monkeypatch.setattr(settings, 'orjson', None)
+        assert settings._dumps_json(data) == fast
+        assert b'"2024-01-01T00:00:00"' in fast
+
 # Integration Tests
 class TestIntegration:
     def test_full_conversion_process(self, image_processor, file_handler, sample_image, temp_dir):
@@ -176,6 +467,22 @@ class TestIntegration:
             saved_art = f.read()
         assert saved_art == ascii_art
 
+    def test_process_image_with_output(self, sample_image, temp_dir, monkeypatch):
+        """Test that the CLI generator saves output with its metadata."""
+        from main import ASCIIArtGenerator
+
+        # Default settings, output and temp paths are relative to the cwd
+        monkeypatch.chdir(temp_dir)
+        generator = ASCIIArtGenerator()
+        output_path = temp_dir / "output" / "art.txt"
+        generator.process_image(str(sample_image), output_path=output_path, color_mode='foreground')
+
+        meta_path = output_path.with_suffix('.meta.json')
+        assert output_path.exists()
+        settings = json.loads(meta_path.read_text(encoding='utf-8'))['settings']
+        assert settings['color_mode'] == 'foreground'
+        assert settings['pattern_mode'] is False
+
     def test_batch_processing(self, image_processor, file_handler, temp_dir):
         """Test batch processing of multiple images."""
         # Create multiple test images